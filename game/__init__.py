@@ -1,18 +1,29 @@
 import numpy as np
 from game.board import Board
 from game.game_setup import setup_game
+from .budget import DecisionBudget
 from .config import GameConfig
 
 
-def run_game(seed: int, config: GameConfig, player_types):
-    # Setup game
-    decks, initial_hands = setup_game(
-        n_players=config.n_players,
-        n_cards=config.n_cards,
-        n_finish=config.n_finish,
-        hand_sizes=config.hand_sizes,
-        seed=seed,
-    )
+def run_game(
+    seed: int,
+    config: GameConfig,
+    player_types,
+    decision_timeout: float | None = None,
+    game_time_budget: float | None = None,
+    setup=None,
+    stop_when_unwinnable: bool = False,
+):
+    # Setup game (unless already provided, e.g. shared among tournament lineups)
+    if setup is None:
+        setup = setup_game(
+            n_players=config.n_players,
+            n_cards=config.n_cards,
+            n_finish=config.n_finish,
+            hand_sizes=config.hand_sizes,
+            seed=seed,
+        )
+    decks, initial_hands = setup
 
     # Init players
     players = [
@@ -27,6 +38,14 @@ def run_game(seed: int, config: GameConfig, player_types):
         for i in range(config.n_players)
     ]
 
+    # Enforce time budgets on players' decisions (if requested)
+    timed = decision_timeout is not None or game_time_budget is not None
+    if timed:
+        for player in players:
+            player.decision_budget = DecisionBudget(
+                decision_timeout=decision_timeout, game_budget=game_time_budget
+            )
+
     # Init board
     board = Board(size=config.board_size, n_cards=config.n_cards)
 
@@ -36,6 +55,7 @@ def run_game(seed: int, config: GameConfig, player_types):
 
     start, start_player_id = False, -1
     win, lose = False, False
+    n_discards_seen = [0] * config.n_players
     while not lose and not win:
         for player in players:
             player.observe_board(board)
@@ -55,6 +75,14 @@ def run_game(seed: int, config: GameConfig, player_types):
                     win = board.check_completion()
                 elif a[0] == "F":
                     lose = True
+            # Let the board know about the cards discarded this turn
+            board.receive_discards(
+                player.discards_history[n_discards_seen[player.id] :]
+            )
+            n_discards_seen[player.id] = len(player.discards_history)
+            # Cut the game short as soon as the board can no longer be completed (if requested)
+            if stop_when_unwinnable and not lose:
+                lose = not board.check_if_completable()
             if win or lose:
                 break
         if win or lose:
@@ -64,4 +92,7 @@ def run_game(seed: int, config: GameConfig, player_types):
         "outcome": "WIN" if np.isnan(board.board).sum() == 0 else "LOSE",
         "history": {player.id: player.action_history for player in players},
         "final_board": board.board,
+        "timing": {player.id: player.decision_budget.get_stats() for player in players}
+        if timed
+        else None,
     }
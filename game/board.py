@@ -1,3 +1,5 @@
+from dataclasses import dataclass
+
 import numpy as np
 from bottleneck import push
 
@@ -10,6 +12,33 @@ def backward_fill_na(arr):
     return np.flip(forward_fill_na(np.flip(arr)))
 
 
+@dataclass
+class Gap:
+    """
+    A maximal run of empty positions on the board, together with the cards bounding it
+    (0 if there's no card on its left, n_cards + 1 if there's no card on its right), the highest
+    numbered card in the game and the number of cards in its range that haven't been discarded yet
+    """
+
+    start: int
+    end: int
+    low: int
+    high: int
+    max_card: int
+    n_available: int = 0
+
+    @property
+    def width(self):
+        return self.end - self.start + 1
+
+    @property
+    def card_range(self):
+        """
+        the (inclusive) range of cards that can still be played in the gap (empty if the first is above the second)
+        """
+        return self.low + 1, min(self.high - 1, self.max_card)
+
+
 class Board:
     def __init__(self, size=36, n_cards=80):
         self.size = size
@@ -20,10 +49,91 @@ class Board:
             np.repeat(np.nan, size),
         )
         self.start, self.finish = False, False
+        # index of the empty gaps, by start position, by position and by card in their range
+        # (numbered cards go from 1 to n_cards - 1)
+        self.gaps = {}
+        self.__gap_at = [None] * size
+        self.__gap_of_card = [None] * (n_cards + 1)
+        self.__discarded = np.zeros(n_cards + 1, dtype=bool)
+        self.__index_gap(
+            Gap(start=0, end=size - 1, low=0, high=n_cards + 1, max_card=n_cards - 1)
+        )
+
+    def __index_gap(self, gap):
+        low, high = gap.card_range
+        gap.n_available = int((~self.__discarded[low : high + 1]).sum())
+        self.gaps[gap.start] = gap
+        self.__gap_at[gap.start : gap.end + 1] = [gap] * gap.width
+        self.__gap_of_card[low : high + 1] = [gap] * max(0, high - low + 1)
+
+    def __update_gaps(self, new_card, position):
+        """
+        splits the gap containing position in (at most) two gaps, and updates the min/max boards within it
+        """
+        gap = self.gaps.pop(self.__gap_at[position].start)
+        self.__gap_at[position] = None
+        self.__gap_of_card[new_card] = None
+        self.min_board[position] = self.max_board[position] = new_card
+        self.max_board[gap.start : position] = new_card
+        self.min_board[position + 1 : gap.end + 1] = new_card
+        if position > gap.start:
+            self.__index_gap(
+                Gap(
+                    start=gap.start,
+                    end=position - 1,
+                    low=gap.low,
+                    high=new_card,
+                    max_card=gap.max_card,
+                )
+            )
+        if position < gap.end:
+            self.__index_gap(
+                Gap(
+                    start=position + 1,
+                    end=gap.end,
+                    low=new_card,
+                    high=gap.high,
+                    max_card=gap.max_card,
+                )
+            )
+
+    def receive_discards(self, cards):
+        """
+        records discarded cards, which can no longer be played in the gaps
+        """
+        for card in cards:
+            if 1 <= card < self.n_cards and not self.__discarded[card]:
+                self.__discarded[card] = True
+                if self.__gap_of_card[card] is not None:
+                    self.__gap_of_card[card].n_available -= 1
 
-    def __update_minmax_board(self):
-        self.max_board = backward_fill_na(self.board)
-        self.min_board = forward_fill_na(self.board)
+    def get_gap(self, position):
+        """
+        returns the empty gap containing position (None if the position is filled)
+        """
+        return self.__gap_at[position]
+
+    def get_min_action_cost(self, position):
+        """
+        returns the minimum number of discards needed to play any card in the position
+        (None if the position is filled or no card can fit in it anymore)
+        """
+        gap = self.__gap_at[position]
+        if gap is None:
+            return None
+        low, high = gap.card_range
+        if low > high:
+            return None
+        left_filled = position == gap.start and gap.start > 0
+        right_filled = position == gap.end and gap.end < self.size - 1
+        return int(left_filled or right_filled)
+
+    def check_if_completable(self):
+        """
+        returns false if some gap is wider than the number of cards that can still be played in it
+        (see receive_discards)
+        """
+        return all(gap.width <= gap.n_available for gap in self.gaps.values())
 
     def check_if_position_legal(self, new_card, position, hand_size):
         if hand_size == 0:
@@ -31,14 +141,15 @@ class Board:
         elif new_card == 0:
             return not self.start
         elif new_card == self.n_cards + 1:
-            return (not self.finish) and (sum(np.isnan(self.board)) == 0)
+            return (not self.finish) and len(self.gaps) == 0
         elif self.get_action_cost(new_card, position) <= hand_size:
-            return np.where(
-                (np.nan_to_num(self.min_board, nan=0) <= new_card)
-                * (np.nan_to_num(self.max_board, nan=self.n_cards + 1) >= new_card),
-                True,
-                False,
-            )[position]
+            return bool(
+                (np.nan_to_num(self.min_board[position], nan=0) <= new_card)
+                * (
+                    np.nan_to_num(self.max_board[position], nan=self.n_cards + 1)
+                    >= new_card
+                )
+            )
         else:
             return False
 
@@ -72,17 +183,17 @@ class Board:
             )
 
     def check_completion(self):
-        return bool(self.start * self.finish * (sum(np.isnan(self.board)) == 0))
+        return bool(self.start * self.finish * (len(self.gaps) == 0))
 
     def receive_card(self, new_card, position, hand_size):
         if new_card == 0:
             assert not self.start
             self.start = True
         elif new_card == self.n_cards + 1:
-            assert (not self.finish) * (sum(np.isnan(self.board)) == 0)
+            assert (not self.finish) * (len(self.gaps) == 0)
             self.finish = True
         else:
             assert self.check_if_position_legal(new_card, position, hand_size)
             self.board[position] = new_card
-            self.__update_minmax_board()
+            self.__update_gaps(new_card, position)
         return self.board
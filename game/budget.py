@@ -0,0 +1,122 @@
+import signal
+import threading
+import time
+import numpy as np
+
+
+class DecisionTimeout(BaseException):
+    pass
+
+
+def _raise_timeout(signum, frame):
+    raise DecisionTimeout()
+
+
+def latency_percentiles(latencies, percentiles=(50, 90, 99), digits=2):
+    """
+    returns a dictionary with the requested percentiles (and the max) of the given latencies, in milliseconds
+    """
+    if len(latencies) == 0:
+        return {}
+    values = np.percentile(np.array(latencies) * 1000, percentiles)
+    result = {f"p{p}": round(float(v), digits) for p, v in zip(percentiles, values)}
+    result["max"] = round(float(np.max(latencies) * 1000), digits)
+    return result
+
+
+class DecisionBudget:
+    """
+    Enforces a per-decision deadline and a total time budget per game on the decisions of a single player.
+    When the deadline is hit, the decision raises an error or the budget is exhausted, the fallback decision is used
+    instead. Deadlines are enforced preemptively with SIGALRM where available (main thread on Unix), and checked
+    after the decision returns otherwise.
+    Decisions run in-process, on the player object itself: the optional restore callback is called right after every
+    decision (before validation and fallback), so that state the agent edited while deciding can be rolled back.
+    """
+
+    def __init__(self, decision_timeout=None, game_budget=None):
+        assert decision_timeout is None or decision_timeout > 0
+        assert game_budget is None or game_budget > 0
+        self.decision_timeout = decision_timeout
+        self.game_budget = game_budget
+        self.elapsed = 0.0
+        self.latencies = []
+        self.timeouts = 0
+        self.errors = 0
+
+    def get_deadline(self):
+        """
+        returns the time available for the next decision (None if unlimited)
+        """
+        if self.game_budget is None:
+            return self.decision_timeout
+        remaining = max(0.0, self.game_budget - self.elapsed)
+        if self.decision_timeout is None:
+            return remaining
+        return min(self.decision_timeout, remaining)
+
+    def __can_preempt(self):
+        return (
+            hasattr(signal, "setitimer")
+            and threading.current_thread() is threading.main_thread()
+        )
+
+    def run(self, decide, fallback, validate, restore=None, **kwargs):
+        """
+        calls decide(**kwargs) within the deadline, falling back to fallback(**kwargs) on overrun, error or
+        invalid action (according to validate(action, **kwargs)), after calling restore() if given
+        """
+        deadline = self.get_deadline()
+        if deadline is not None and deadline <= 0:
+            self.timeouts += 1
+            return fallback(**kwargs)
+
+        preempt = deadline is not None and self.__can_preempt()
+        if preempt:
+            previous_handler = signal.signal(signal.SIGALRM, _raise_timeout)
+        start = time.perf_counter()
+        try:
+            # the timer is cancelled within the outer try, so that a timeout firing right after decide returns
+            # is still caught
+            try:
+                if preempt:
+                    signal.setitimer(signal.ITIMER_REAL, deadline)
+                action, timed_out, failed = decide(**kwargs), False, False
+            finally:
+                if preempt:
+                    signal.setitimer(signal.ITIMER_REAL, 0)
+        except DecisionTimeout:
+            action, timed_out, failed = None, True, False
+        except Exception:
+            action, timed_out, failed = None, False, True
+        finally:
+            if preempt:
+                signal.signal(signal.SIGALRM, previous_handler)
+            latency = time.perf_counter() - start
+        self.elapsed += latency
+        self.latencies.append(latency)
+        if restore is not None:
+            restore()
+
+        if timed_out or (deadline is not None and latency > deadline):
+            self.timeouts += 1
+            return fallback(**kwargs)
+        try:
+            valid = not failed and validate(action, **kwargs)
+        except Exception:
+            valid = False
+        if not valid:
+            self.errors += 1
+            return fallback(**kwargs)
+        return action
+
+    def get_stats(self):
+        """
+        returns the timing statistics collected so far
+        """
+        return {
+            "latencies": self.latencies,
+            "timeouts": self.timeouts,
+            "errors": self.errors,
+            "elapsed": self.elapsed,
+        }
@@ -1,5 +1,6 @@
 import numpy as np
 from abc import ABC, abstractmethod
+from collections import Counter
 from itertools import combinations
 
 
@@ -19,6 +20,7 @@ class Player(ABC):
         self.players_discards = [0 for i in range(n_players)]
         self.players_hand_sizes = [len(initial_hand) for i in range(n_players)]
         self.players_deck_sizes = [None for i in range(n_players)]
+        self.decision_budget = None
 
     def check_possible_discard(self):
         """
@@ -103,6 +105,86 @@ class Player(ABC):
         """
         self.hand.remove(card)
 
+    def default_action(self):
+        """
+        returns the fallback action used when decide_action overruns its time budget, fails or returns an invalid
+        action: the first possible discard if passing is allowed, the first possible play otherwise
+        """
+        if self.check_possible_discard():
+            return self.get_all_possible_discards(self.pass_discard_size)[0]
+        return self.get_all_possible_plays()[0]
+
+    def default_discards_start(self, n_to_discard):
+        """
+        returns the fallback discards used when decide_discards_start overruns its time budget, fails or returns
+        invalid discards
+        """
+        return self.get_all_possible_discards(n_to_discard)[0]
+
+    def check_if_valid_discards(self, discards, n_discards, hand=None):
+        """
+        returns true if discards are n_discards cards in the hand (finish cards can be repeated)
+        """
+        hand = self.hand if hand is None else hand
+        return len(discards) == n_discards and Counter(discards) <= Counter(hand)
+
+    def check_if_valid_action(self, action):
+        """
+        returns true if the action returned by decide_action can be applied: a discard of pass_discard_size cards
+        in the hand, or a legal play of a card in the hand paying its cost with other cards in the hand
+        """
+        if not isinstance(action, dict):
+            return False
+        if action.get("type") == "D":
+            return self.check_if_valid_discards(
+                action["discards"], self.pass_discard_size
+            )
+        if action.get("type") == "P":
+            card, position = action["card_played"], action["position"]
+            return (
+                card in self.hand
+                and 0 <= position < self.board.size
+                and self.board.check_if_position_legal(
+                    card, position, len(self.hand) - 1
+                )
+                and self.check_if_valid_discards(
+                    action["discards"],
+                    self.board.get_action_cost(card, position),
+                    hand=Counter(self.hand) - Counter([card]),
+                )
+            )
+        return False
+
+    def check_if_valid_discards_start(self, action, n_to_discard):
+        """
+        returns true if the action returned by decide_discards_start discards n_to_discard cards in the hand
+        """
+        return isinstance(action, dict) and self.check_if_valid_discards(
+            action["discards"], n_to_discard
+        )
+
+    def __decide(self, decide, fallback, validate, **kwargs):
+        if self.decision_budget is None:
+            return decide(**kwargs)
+        # agents must not edit their cards while deciding: roll back whatever a failed, preempted or misbehaving
+        # decision left behind
+        hand, deck, discards_history = (
+            list(self.hand),
+            list(self.deck),
+            list(self.discards_history),
+        )
+
+        def restore():
+            self.hand, self.deck, self.discards_history = (
+                hand,
+                deck,
+                discards_history,
+            )
+
+        return self.decision_budget.run(
+            decide, fallback, validate, restore=restore, **kwargs
+        )
+
     @abstractmethod
     def decide_action(self):
         # returns a dictionary.
@@ -147,11 +229,18 @@ class Player(ABC):
             a = "W"
             self.play_card(self.n_cards + 1)
         elif start_turn_discards > 0:
-            action = self.decide_discards_start(n_to_discard=start_turn_discards)
+            action = self.__decide(
+                self.decide_discards_start,
+                self.default_discards_start,
+                self.check_if_valid_discards_start,
+                n_to_discard=start_turn_discards,
+            )
             self.discard_cards(action["discards"])
             a = ("DS", len(action["discards"]))
         else:
-            action = self.decide_action()
+            action = self.__decide(
+                self.decide_action, self.default_action, self.check_if_valid_action
+            )
             if action["type"] == "P":
                 self.play_card(action["card_played"])
                 a = (
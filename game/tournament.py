@@ -0,0 +1,64 @@
+from copy import deepcopy
+from functools import lru_cache
+from itertools import product
+
+import numpy as np
+
+from .config import GameConfig
+from .game_setup import setup_game
+
+
+def enumerate_lineups(n_agents, n_players, n_samples=None, seed=0):
+    """
+    returns the list of lineups (tuples with the agent index of every seat): all the seat assignments if n_samples is
+    None, otherwise n_samples distinct assignments sampled uniformly at random
+    """
+    n_lineups = n_agents**n_players
+    if n_samples is None or n_samples >= n_lineups:
+        return list(product(range(n_agents), repeat=n_players))
+    rng = np.random.default_rng(seed)
+    lineups = set()
+    while len(lineups) < n_samples:
+        lineups.add(tuple(int(a) for a in rng.integers(n_agents, size=n_players)))
+    return sorted(lineups)
+
+
+@lru_cache(maxsize=8)
+def _cached_setup(seed, n_players, n_cards, n_finish, hand_sizes):
+    decks, initial_hands = setup_game(
+        n_players=n_players,
+        n_cards=n_cards,
+        n_finish=n_finish,
+        hand_sizes=hand_sizes,
+        seed=seed,
+    )
+    return decks, initial_hands, np.random.get_state()
+
+
+def get_shared_setup(seed: int, config: GameConfig):
+    """
+    returns the decks and initial hands for the given seed, computing them only once per seed and process.
+    The global random state is restored to what it would be right after setup_game, so that every lineup
+    playing the same seed sees exactly the same game
+    """
+    decks, initial_hands, random_state = _cached_setup(
+        seed, config.n_players, config.n_cards, config.n_finish, config.hand_sizes
+    )
+    np.random.set_state(random_state)
+    return deepcopy(decks), deepcopy(initial_hands)
+
+
+def fit_ratings(lineups, scores, n_agents):
+    """
+    estimates the contribution of a single seat played by each agent to the score of a game, by least squares
+    regression of the scores on the number of seats taken by each agent in the lineup (nan for agents never seated)
+    """
+    counts = np.array(
+        [np.bincount(lineup, minlength=n_agents) for lineup in lineups], dtype=float
+    )
+    seated = counts.sum(axis=0) > 0
+    ratings = np.repeat(np.nan, n_agents)
+    ratings[seated], *_ = np.linalg.lstsq(
+        counts[:, seated], np.array(scores, dtype=float), rcond=None
+    )
+    return ratings
@@ -1,5 +1,7 @@
 from game import run_game, GameConfig
+from game.budget import latency_percentiles
 from game.player import Player
+from game.tournament import enumerate_lineups, fit_ratings, get_shared_setup
 from tqdm.contrib.concurrent import process_map
 import argparse
 from collections import Counter
@@ -66,6 +68,45 @@ parser.add_argument(
     default=cpu_count(),
     help=f"The number of processes to use for concurrent game evaluation (default on this host: {cpu_count()})",
 )
+parser.add_argument(
+    "--stop-unwinnable-games",
+    action="store_true",
+    default=False,
+    help="Whether to stop games as soon as the board can no longer be completed, instead of playing them out",
+)
+# Tournament config
+tournament_group = parser.add_argument_group(
+    "tournament", "Round-robin tournament configurations"
+)
+tournament_group.add_argument(
+    "--tournament",
+    action="store_true",
+    default=False,
+    help="Whether to play every lineup of the given players (one agent per seat) on every game and rank the agents",
+)
+tournament_group.add_argument(
+    "--tournament-lineups",
+    type=int,
+    default=None,
+    help="The number of lineups to sample for the tournament (default: all the seat assignments)",
+)
+# Time budget config
+budget_group = parser.add_argument_group(
+    "budget",
+    "Time budget configurations (players overrunning them fall back to a default action)",
+)
+budget_group.add_argument(
+    "--decision-timeout",
+    type=float,
+    default=None,
+    help="The maximum number of seconds each player can take for a single decision",
+)
+budget_group.add_argument(
+    "--game-time-budget",
+    type=float,
+    default=None,
+    help="The total number of seconds each player can spend deciding over a game",
+)
 # Metrics config
 metrics_group = parser.add_argument_group("metrics", "Metrics display configurations")
 metrics_group.add_argument(
@@ -94,11 +135,17 @@ config = GameConfig(
 )
 
 assert (
-    len(args.players) == 1 or len(args.players) == args.n_players
+    args.tournament or len(args.players) == 1 or len(args.players) == args.n_players
 ), f"Must configure either 1 or {args.n_players} players"
-players_paths = (
-    args.players * args.n_players if len(args.players) == 1 else args.players
-)
+assert (
+    args.tournament_lineups is None or args.tournament_lineups >= 1
+), "Must sample at least 1 tournament lineup"
+if args.tournament:
+    players_paths = list(dict.fromkeys(args.players))
+else:
+    players_paths = (
+        args.players * args.n_players if len(args.players) == 1 else args.players
+    )
 player_types = []
 for i, player_path in enumerate(players_paths):
     try:
@@ -133,6 +180,7 @@ def compute_metrics(
     outcome,
     history,
     final_board,
+    timing=None,
     percentage_digits=2,
 ):
     # Number of filled board spaces
@@ -174,7 +222,7 @@ def compute_metrics(
     # Remaining deck size
     remaining_deck_size = config.n_cards - total_discarded_cards - filled_board_spaces
 
-    return {
+    metrics = {
         "outcome": outcome,
         "filled_board_spaces": filled_board_spaces,
         "percentage_filled_board_spaces": round(
@@ -197,6 +245,25 @@ def compute_metrics(
         "remaining_deck_size": remaining_deck_size,
     }
 
+    # Timeouts, errors and decision latencies per player (only if time budgets are enforced)
+    if timing is not None:
+        metrics["timeouts_by_player"] = {
+            player_remapping_dict[id]: t["timeouts"] for id, t in timing.items()
+        }
+        metrics["total_timeouts"] = sum(t["timeouts"] for t in timing.values())
+        metrics["decision_errors_by_player"] = {
+            player_remapping_dict[id]: t["errors"] for id, t in timing.items()
+        }
+        metrics["total_decision_errors"] = sum(t["errors"] for t in timing.values())
+        metrics["latency_ms_by_player"] = {
+            player_remapping_dict[id]: latency_percentiles(
+                t["latencies"], digits=percentage_digits
+            )
+            for id, t in timing.items()
+        }
+
+    return metrics
+
 
 def print_metrics(game_id, metrics):
     heading = f"# Metrics for game {game_id} #"
@@ -210,13 +277,19 @@ def print_metrics(game_id, metrics):
 n_wins = 0
 total_metrics = {}
 best_game_results = {"outcome": None, "results": None, "metrics": None}
+latencies_by_player = {}
 
 
 def _process_game(game_id):
     with warnings.catch_warnings():
         warnings.simplefilter("ignore")
         results = run_game(
-            seed=args.start_seed + game_id, config=config, player_types=player_types
+            seed=args.start_seed + game_id,
+            config=config,
+            player_types=player_types,
+            decision_timeout=args.decision_timeout,
+            game_time_budget=args.game_time_budget,
+            stop_when_unwinnable=args.stop_unwinnable_games,
         )
     metrics = compute_metrics(
         game_config=config,
@@ -227,6 +300,117 @@ def _process_game(game_id):
     return game_id, results, metrics
 
 
+def _process_tournament_game(task):
+    game_id, lineup = task
+    seed = args.start_seed + game_id
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        results = run_game(
+            seed=seed,
+            config=config,
+            player_types=[player_types[agent] for agent in lineup],
+            decision_timeout=args.decision_timeout,
+            game_time_budget=args.game_time_budget,
+            setup=get_shared_setup(seed, config),
+            stop_when_unwinnable=args.stop_unwinnable_games,
+        )
+    filled = (~np.isnan(results["final_board"])).sum() / config.board_size
+    # Merge the timing statistics of the seats played by the same agent
+    timing = None
+    if results["timing"] is not None:
+        timing = {}
+        for seat, agent in enumerate(lineup):
+            t = timing.setdefault(agent, {"latencies": [], "timeouts": 0, "errors": 0})
+            t["latencies"].extend(results["timing"][seat]["latencies"])
+            t["timeouts"] += results["timing"][seat]["timeouts"]
+            t["errors"] += results["timing"][seat]["errors"]
+    return lineup, results["outcome"] == "WIN", filled, timing
+
+
+def run_tournament():
+    n_agents = len(player_types)
+    lineups = enumerate_lineups(
+        n_agents,
+        config.n_players,
+        n_samples=args.tournament_lineups,
+        seed=args.start_seed,
+    )
+    # Lineups are scheduled seed by seed, so that each worker reuses the same deck setup across lineups
+    tasks = [(game_id, lineup) for game_id in range(args.games) for lineup in lineups]
+    played_lineups, wins, filled = [], [], []
+    timed = args.decision_timeout is not None or args.game_time_budget is not None
+    latencies = [[] for _ in range(n_agents)]
+    timeouts, errors = np.zeros(n_agents, dtype=int), np.zeros(n_agents, dtype=int)
+    for lineup, win, f, timing in process_map(
+        _process_tournament_game,
+        tasks,
+        max_workers=args.num_processes,
+        chunksize=max(1, len(tasks) // args.num_processes),
+    ):
+        played_lineups.append(lineup)
+        wins.append(win)
+        filled.append(f)
+        if timing is not None:
+            for agent, t in timing.items():
+                latencies[agent].extend(t["latencies"])
+                timeouts[agent] += t["timeouts"]
+                errors[agent] += t["errors"]
+
+    # Estimate the contribution of each agent's seat to winning and to filling the board
+    win_ratings = fit_ratings(played_lineups, wins, n_agents)
+    filled_ratings = fit_ratings(played_lineups, filled, n_agents)
+    seats = np.bincount(np.ravel(played_lineups), minlength=n_agents)
+    wins, filled = np.array(wins), np.array(filled)
+
+    print(f"Tournament: {len(lineups)} lineups x {args.games} games")
+    print(
+        f"{'rank':<6}{'agent':<40}{'seats':>8}{'win_rating':>14}{'filled_rating':>16}"
+        f"{'win_rate':>12}{'avg_filled':>12}",
+        end="",
+    )
+    if timed:
+        print(f"{'timeouts':>10}{'errors':>10}{'p50_ms':>10}{'p99_ms':>10}", end="")
+    print()
+    # Agents never seated (possible when sampling lineups) are listed as unrated after the ranked ones
+    rated = np.flatnonzero(seats > 0)
+    ranking = rated[np.lexsort((-filled_ratings[rated], -win_ratings[rated]))]
+    for rank, agent in enumerate(ranking):
+        in_lineup = np.array([agent in lineup for lineup in played_lineups])
+        print(
+            f"{rank + 1:<6}{player_types[agent].__name__ + f' ({players_paths[agent]})':<40}"
+            f"{seats[agent]:>8}"
+            f"{win_ratings[agent]:>14.{args.percentage_digits + 2}f}"
+            f"{filled_ratings[agent]:>16.{args.percentage_digits + 2}f}"
+            f"{wins[in_lineup].mean():>12.{args.percentage_digits}f}"
+            f"{filled[in_lineup].mean():>12.{args.percentage_digits}f}",
+            end="",
+        )
+        if timed:
+            percentiles = latency_percentiles(
+                latencies[agent], percentiles=(50, 99), digits=args.percentage_digits
+            )
+            print(
+                f"{timeouts[agent]:>10}{errors[agent]:>10}"
+                f"{percentiles.get('p50', np.nan):>10}{percentiles.get('p99', np.nan):>10}",
+                end="",
+            )
+        print()
+    for agent in np.flatnonzero(seats == 0):
+        print(
+            f"{'-':<6}{player_types[agent].__name__ + f' ({players_paths[agent]})':<40}"
+            f"{0:>8}{'unrated':>14}{'-':>16}{'-':>12}{'-':>12}",
+            end="",
+        )
+        if timed:
+            print(f"{'-':>10}{'-':>10}{'-':>10}{'-':>10}", end="")
+        print()
+
+
+if args.tournament:
+    run_tournament()
+    exit(0)
+
+
 for game_id, results, metrics in process_map(
     _process_game,
     range(args.games),
@@ -265,6 +449,13 @@ for game_id, results, metrics in process_map(
         if isinstance(value, numbers.Number):
             total_metrics[key] = total_metrics.get(key, 0) + value
 
+    # Collect decision latencies
+    if results["timing"] is not None:
+        for id, t in results["timing"].items():
+            latencies_by_player.setdefault(player_remapping_dict[id], []).extend(
+                t["latencies"]
+            )
+
     # Print metrics if enabled
     if args.print_metrics_every_game:
         print_metrics(game_id=game_id, metrics=metrics)
@@ -282,3 +473,13 @@ print_metrics(
     game_id=f"BEST (id: {best_game_results['game_id']}, seed: {args.start_seed + best_game_results['game_id']})",
     metrics=best_game_results["metrics"],
 )
+
+# Print decision latency percentiles per player (if time budgets are enforced)
+if len(latencies_by_player) > 0:
+    print_metrics(
+        game_id="LATENCY (ms)",
+        metrics={
+            name: latency_percentiles(latencies, digits=args.percentage_digits)
+            for name, latencies in latencies_by_player.items()
+        },
+    )